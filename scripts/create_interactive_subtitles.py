@@ -2,56 +2,67 @@
 
 """
 create_interactive_subtitles.py
-Creates interactive subtitles overlay for short videos using MoviePy
+Cuts 9:16 shorts from downloaded videos and burns in interactive subtitles in one ffmpeg pass
 Usage: python3 create_interactive_subtitles.py
 """
 
 import os
 import sys
-import json
 import re
+import functools
+import subprocess
+import tempfile
+import textwrap
+import numpy as np
+import orjson
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from moviepy.editor import VideoFileClip, TextClip, CompositeVideoClip
 # Note: moviepy.config.check_for_packages doesn't exist in v1.0.3
 
 # Configuration
+DOWNLOAD_DIR = os.path.expanduser("~/automation/download")
 SHORTS_DIR = os.path.expanduser("~/automation/shorts")
 SUBTITLES_DIR = os.path.expanduser("~/automation/subtitles")
+VAAPI_DEVICE = "/dev/dri/renderD128"
+SHORT_SIZE = (1080, 1920)  # 9:16 vertical output
+NVENC_MAX_SESSIONS = 3  # Consumer NVIDIA drivers limit concurrent NVENC encodes
+
+# One SRT cue: timestamp line (HH:MM:SS,mmm --> HH:MM:SS,mmm) followed by its text lines;
+# a blank or whitespace-only line ends the cue
+_SRT_CUE_RE = re.compile(
+    rb'(\d{2}):(\d{2}):(\d{2}),(\d{3})\s*-->\s*(\d{2}):(\d{2}):(\d{2}),(\d{3})[^\n]*\n'
+    rb'((?:[^\n]*\S[^\n]*(?:\n|\Z))*)'
+)
 
 def parse_srt_file(srt_path):
     """Parse SRT file and extract subtitle entries with timestamps"""
-    subtitles = []
-    
     try:
-        with open(srt_path, 'r', encoding='utf-8') as f:
-            content = f.read().strip()
-        
-        # Split by double newlines to get individual subtitle blocks
-        blocks = re.split(r'\n\s*\n', content)
-        
-        for block in blocks:
-            lines = block.strip().split('\n')
-            if len(lines) >= 3:
-                # Parse timestamp line (format: 00:00:01,000 --> 00:00:04,000)
-                timestamp_line = lines[1]
-                match = re.match(r'(\d{2}:\d{2}:\d{2},\d{3})\s*-->\s*(\d{2}:\d{2}:\d{2},\d{3})', timestamp_line)
-                
-                if match:
-                    start_time = match.group(1)
-                    end_time = match.group(2)
-                    
-                    # Join all remaining lines as subtitle text
-                    text = ' '.join(lines[2:]).strip()
-                    
-                    # Convert timestamp to seconds
-                    start_seconds = timestamp_to_seconds(start_time)
-                    end_seconds = timestamp_to_seconds(end_time)
-                    
-                    subtitles.append({
-                        'start': start_seconds,
-                        'end': end_seconds,
-                        'text': text
-                    })
+        with open(srt_path, 'rb') as f:
+            content = f.read().replace(b'\r\n', b'\n')
+        
+        # Find every cue in a single pass over the file
+        matches = _SRT_CUE_RE.findall(content)
+        if not matches:
+            return []
+        
+        # Convert all timestamps to seconds at once: columns are
+        # start h/m/s/ms followed by end h/m/s/ms
+        times = np.array([match[:8] for match in matches], dtype=np.int64)
+        starts = times[:, 0] * 3600 + times[:, 1] * 60 + times[:, 2] + times[:, 3] / 1000.0
+        ends = times[:, 4] * 3600 + times[:, 5] * 60 + times[:, 6] + times[:, 7] / 1000.0
+        
+        subtitles = []
+        for start_seconds, end_seconds, match in zip(starts.tolist(), ends.tolist(), matches):
+            # Join all text lines of the cue
+            text = match[8].decode('utf-8').replace('\n', ' ').strip()
+            
+            if text:
+                subtitles.append({
+                    'start': start_seconds,
+                    'end': end_seconds,
+                    'text': text
+                })
         
         return subtitles
         
@@ -59,141 +70,263 @@ def parse_srt_file(srt_path):
         print(f"❌ Error parsing SRT file {srt_path}: {e}")
         return []
 
-def timestamp_to_seconds(timestamp):
-    """Convert SRT timestamp (HH:MM:SS,mmm) to seconds"""
-    time_part, ms_part = timestamp.split(',')
-    h, m, s = map(int, time_part.split(':'))
-    ms = int(ms_part)
-    
-    return h * 3600 + m * 60 + s + ms / 1000.0
+@functools.lru_cache(maxsize=256)
+def render_subtitle_text(text, font_size):
+    """Render subtitle text once per (text, font size); MoviePy's set_* methods return copies"""
+    return TextClip(text,
+                    fontsize=font_size,
+                    color='white',
+                    stroke_color='black',
+                    stroke_width=3,
+                    font='Liberation-Sans-Bold',
+                    method='label')
 
-def create_word_highlighting_clips(text, start_time, end_time, video_size):
-    """Create interactive word-by-word highlighting subtitle clips"""
+def create_subtitle_clip(text, start_time, end_time, video_size):
+    """Create a subtitle text clip optimized for 9:16 vertical videos with better formatting"""
     duration = end_time - start_time
     words = text.split()
     
-    if not words:
-        return []
+    font_size = min(70, video_size[0] // 12)
+    y_position = video_size[1] * 0.82  # Slightly lower
     
-    # Calculate time per word with slight overlap for smooth transitions
-    time_per_word = duration / len(words)
+    # 'label' does not auto-wrap, so break lines at word boundaries ourselves
+    # (roughly 0.6 * font size per character across 90% of the width)
+    max_line_chars = max(1, int(video_size[0] * 0.9 / (font_size * 0.6)))
     
+    # Limit to 4-5 words maximum for better readability, splitting
+    # longer text into multiple shorter clips
+    max_words = 5
     clips = []
-    font_size = min(100, video_size[0] // 10)  # Larger font for better visibility
-    y_position = video_size[1] * 0.75  # Match background subtitle position
-    
-    for i, word in enumerate(words):
-        word_start = start_time + (i * time_per_word)
-        word_end = min(start_time + ((i + 1) * time_per_word), end_time)
-        word_duration = word_end - word_start
-        
-        if word_duration <= 0:
-            continue
+    for i in range(0, len(words), max_words):
+        chunk_words = words[i:i + max_words]
+        chunk_text = textwrap.fill(' '.join(chunk_words), width=max_line_chars)
         
-        # Create highlighted version (current word being spoken)
-        highlighted_clip = TextClip(word,
-                                  fontsize=font_size,
-                                  color='#FFD700',  # Gold color for highlight
-                                  stroke_color='black',
-                                  stroke_width=4,
-                                  font='Liberation-Sans-Bold')
+        # Calculate timing for this chunk
+        chunk_duration = duration * len(chunk_words) / len(words)
+        chunk_start = start_time + (duration * i / len(words))
         
-        # Position to match background text
-        highlighted_clip = highlighted_clip.set_position(('center', y_position)).set_duration(word_duration).set_start(word_start)
-        clips.append(highlighted_clip)
+        txt_clip = render_subtitle_text(chunk_text, font_size)
+        txt_clip = txt_clip.set_position(('center', y_position)).set_duration(chunk_duration).set_start(chunk_start)
+        clips.append(txt_clip)
     
     return clips
 
-def create_subtitle_clip(text, start_time, end_time, video_size):
-    """Create a subtitle text clip optimized for 9:16 vertical videos with better formatting"""
-    duration = end_time - start_time
-    words = text.split()
+def get_video_size(video_path):
+    """Get (width, height) of the first video stream using ffprobe"""
+    output = subprocess.check_output([
+        'ffprobe', '-v', 'error',
+        '-select_streams', 'v:0',
+        '-show_entries', 'stream=width,height',
+        '-of', 'csv=p=0',
+        video_path
+    ], text=True)
+    width, height = output.strip().split(',')[:2]
+    
+    return int(width), int(height)
+
+def seconds_to_ass_timestamp(seconds):
+    """Convert seconds to ASS timestamp (H:MM:SS.cc)"""
+    centiseconds = int(round(seconds * 100))
+    h, remainder = divmod(centiseconds, 360000)
+    m, remainder = divmod(remainder, 6000)
+    s, cs = divmod(remainder, 100)
     
-    # Limit to 4-5 words maximum for better readability
+    return f"{h}:{m:02d}:{s:02d}.{cs:02d}"
+
+def escape_ass_text(text):
+    """Neutralize characters that ASS would interpret as override tags"""
+    return text.replace('\\', '/').replace('{', '(').replace('}', ')')
+
+def emit_ass(clip_subtitles, video_size, out_path):
+    """Write subtitles as an ASS file with karaoke word-by-word highlighting"""
+    width, height = video_size
+    font_size = width // 12
+    margin_h = int(width * 0.05)
+    margin_v = int(height * 0.15)
+    
+    # Words are drawn in SecondaryColour (white) and filled with
+    # PrimaryColour (gold, #FFD700 in ASS BGR order) as they are spoken
+    lines = [
+        "[Script Info]",
+        "ScriptType: v4.00+",
+        f"PlayResX: {width}",
+        f"PlayResY: {height}",
+        "WrapStyle: 0",
+        "ScaledBorderAndShadow: yes",
+        "",
+        "[V4+ Styles]",
+        "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, "
+        "Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, "
+        "Alignment, MarginL, MarginR, MarginV, Encoding",
+        f"Style: Default,Liberation Sans,{font_size},&H0000D7FF,&H00FFFFFF,&H00000000,&H00000000,"
+        f"-1,0,0,0,100,100,0,0,1,3,0,2,{margin_h},{margin_h},{margin_v},1",
+        "",
+        "[Events]",
+        "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text",
+    ]
+    
+    # Limit to 4-5 words maximum per line for better readability
     max_words = 5
-    if len(words) > max_words:
-        # Split into multiple shorter clips
-        clips = []
+    for sub in clip_subtitles:
+        words = sub['text'].split()
+        if not words:
+            continue
+        
+        duration = sub['end'] - sub['start']
         for i in range(0, len(words), max_words):
             chunk_words = words[i:i + max_words]
-            chunk_text = ' '.join(chunk_words)
+            chunk_start = sub['start'] + (duration * i / len(words))
+            chunk_end = chunk_start + (duration * len(chunk_words) / len(words))
             
-            # Calculate timing for this chunk
-            chunk_duration = duration * len(chunk_words) / len(words)
-            chunk_start = start_time + (duration * i / len(words))
+            # Karaoke durations are in centiseconds; round cumulatively so
+            # the per-word timings add up to the chunk duration
+            time_per_word = (chunk_end - chunk_start) * 100 / len(chunk_words)
+            karaoke = []
+            for j, word in enumerate(chunk_words):
+                word_cs = round((j + 1) * time_per_word) - round(j * time_per_word)
+                karaoke.append(f"{{\\kf{word_cs}}}{escape_ass_text(word)}")
             
-            formatted_text = chunk_text
-            font_size = min(70, video_size[0] // 12)
-            
-            txt_clip = TextClip(formatted_text,
-                               fontsize=font_size,
-                               color='white',
-                               stroke_color='black',
-                               stroke_width=3,
-                               font='Liberation-Sans-Bold',
-                               method='caption',
-                               size=(video_size[0] * 0.9, None))
-            
-            y_position = video_size[1] * 0.82  # Slightly lower
-            txt_clip = txt_clip.set_position(('center', y_position)).set_duration(chunk_duration).set_start(chunk_start)
-            clips.append(txt_clip)
-        
-        return clips
+            lines.append(
+                f"Dialogue: 0,{seconds_to_ass_timestamp(chunk_start)},{seconds_to_ass_timestamp(chunk_end)},"
+                f"Default,,0,0,0,,{' '.join(karaoke)}"
+            )
+    
+    with open(out_path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+
+def copy_video(video_path, output_path):
+    """Copy video and audio streams into a new file without decoding or re-encoding"""
+    subprocess.run(['ffmpeg', '-y', '-i', video_path, '-c', 'copy', output_path], check=True)
+
+def can_encode_with(input_args, video_filter, codec):
+    """Check whether ffmpeg can actually encode a short test clip with the given encoder"""
+    command = ['ffmpeg', '-v', 'error'] + input_args + [
+        '-f', 'lavfi', '-i', 'testsrc=duration=1:size=320x240:rate=1'
+    ]
+    if video_filter:
+        command += ['-vf', video_filter]
+    command += ['-c:v', codec, '-f', 'null', '-']
+    
+    try:
+        result = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except OSError:
+        return False
+    
+    return result.returncode == 0
+
+@functools.lru_cache(maxsize=1)
+def detect_video_encoder():
+    """Pick the fastest working H.264 encoder: NVENC, then VAAPI, then libx264"""
+    if can_encode_with([], None, 'h264_nvenc'):
+        return {
+            'name': 'NVIDIA GPU (NVENC)',
+            'input_args': [],
+            'filter_suffix': None,
+            'codec_args': ['-c:v', 'h264_nvenc', '-preset', 'p5', '-rc', 'vbr', '-cq', '20',
+                           '-b:v', '8M', '-maxrate', '12M'],
+            'max_sessions': NVENC_MAX_SESSIONS,
+        }
+    
+    vaapi_input_args = ['-vaapi_device', VAAPI_DEVICE]
+    if can_encode_with(vaapi_input_args, 'format=nv12,hwupload', 'h264_vaapi'):
+        return {
+            'name': 'Intel/AMD GPU (VAAPI)',
+            'input_args': vaapi_input_args,
+            'filter_suffix': 'format=nv12,hwupload',
+            'codec_args': ['-c:v', 'h264_vaapi', '-b:v', '8M', '-maxrate', '12M'],
+            'max_sessions': None,
+        }
+    
+    return {
+        'name': 'CPU (libx264)',
+        'input_args': [],
+        'filter_suffix': None,
+        'codec_args': ['-c:v', 'libx264', '-preset', 'faster', '-crf', '20'],
+        'max_sessions': None,
+    }
+
+def encode_video(video_path, output_path, video_filter, start=None, duration=None, encoder=None):
+    """Decode, filter and re-encode video (optionally trimmed) in a single ffmpeg pass"""
+    encoder = encoder or detect_video_encoder()
+    
+    # VAAPI needs frames uploaded to the GPU after software filtering
+    if encoder['filter_suffix']:
+        video_filter = f"{video_filter},{encoder['filter_suffix']}"
+    
+    # Seeking on the input keeps decoding to the clip and restarts
+    # timestamps at zero, which is what the clip-relative subtitles expect
+    trim_args = []
+    if start is not None:
+        trim_args += ['-ss', str(start)]
+    if duration is not None:
+        trim_args += ['-t', str(duration)]
+    
+    command = ['ffmpeg', '-y'] + encoder['input_args'] + trim_args + [
+        '-i', video_path,
+        '-vf', video_filter,
+    ] + encoder['codec_args'] + [
+        '-c:a', 'aac',
+        '-b:a', '320k',
+        output_path
+    ]
+    
+    subprocess.run(command, check=True)
+
+@functools.lru_cache(maxsize=None)
+def time_to_seconds(time_str):
+    """Convert HH:MM:SS format to seconds"""
+    if len(time_str) == 8:
+        # Fixed-width HH:MM:SS as written by suggest_clip.py
+        return int(time_str[0:2]) * 3600 + int(time_str[3:5]) * 60 + int(time_str[6:8])
+    
+    h, m, s = map(int, time_str.split(':'))
+    return h * 3600 + m * 60 + s
+
+def get_short_crop_filter(video_size):
+    """Build the filter that crops a source video to 9:16 and scales it to the short size"""
+    width, height = video_size
+    short_width, short_height = SHORT_SIZE
+    
+    if width * 16 > height * 9:
+        # Video is wider than 9:16, crop horizontally from the center
+        crop_width = height * 9 // 16
+        crop = f"crop={crop_width}:{height}:{(width - crop_width) // 2}:0"
     else:
-        # Single clip for short text
-        formatted_text = ' '.join(words)
-        font_size = min(70, video_size[0] // 12)
-        
-        txt_clip = TextClip(formatted_text,
-                           fontsize=font_size,
-                           color='white',
-                           stroke_color='black',
-                           stroke_width=3,
-                           font='Liberation-Sans-Bold',
-                           method='caption',
-                           size=(video_size[0] * 0.9, None))
-        
-        y_position = video_size[1] * 0.82
-        txt_clip = txt_clip.set_position(('center', y_position)).set_duration(duration).set_start(start_time)
-        
-        return [txt_clip]
+        # Video is taller than 9:16, crop vertically from the top third to keep faces
+        crop_height = width * 16 // 9
+        crop = f"crop={width}:{crop_height}:0:{(height - crop_height) // 3}"
+    
+    return (f"{crop},scale={short_width}:{short_height}:force_original_aspect_ratio=decrease,"
+            f"pad={short_width}:{short_height}:(ow-iw)/2:(oh-ih)/2:black,setsar=1")
 
-def add_interactive_subtitles_with_timing(video_path, srt_path, clip_path, output_path):
-    """Add interactive subtitles to video with clip timing adjustment"""
+def add_interactive_subtitles_with_timing(video_path, srt_path, clip_path, output_path, encoder=None):
+    """Cut the clip from the source video, crop it to 9:16 and burn in interactive subtitles"""
     print(f"🎬 Loading video: {video_path}")
     
     try:
         # Load clip timing
-        with open(clip_path, 'r') as f:
-            clip_data = json.load(f)
+        with open(clip_path, 'rb') as f:
+            clip_data = orjson.loads(f.read())
         
         # Convert clip start/end to seconds
-        def time_to_seconds(time_str):
-            """Convert HH:MM:SS format to seconds"""
-            h, m, s = map(int, time_str.split(':'))
-            return h * 3600 + m * 60 + s
-        
         clip_start = time_to_seconds(clip_data['start'])
         clip_end = time_to_seconds(clip_data['end'])
         clip_duration = clip_end - clip_start
         
         print(f"📊 Clip timing: {clip_data['start']} to {clip_data['end']} ({clip_duration:.1f}s)")
         
-        # Load video
-        video = VideoFileClip(video_path)
-        video_size = video.size
+        video_size = get_video_size(video_path)
         
-        print(f"📊 Video size: {video_size}, Duration: {video.duration:.2f}s")
+        print(f"📊 Video size: {video_size}, output size: {SHORT_SIZE}")
         
-        # Parse subtitles
-        print(f"📝 Parsing subtitles: {srt_path}")
-        all_subtitles = parse_srt_file(srt_path)
+        # Crop and scale happen in the same filtergraph as the subtitles
+        video_filter = get_short_crop_filter(video_size)
         
-        if not all_subtitles:
-            print("⚠️  No subtitles found, saving video without subtitles")
-            video.write_videofile(output_path, codec='libx264', audio_codec='aac')
-            video.close()
-            return
+        # Parse subtitles
+        all_subtitles = []
+        if srt_path:
+            print(f"📝 Parsing subtitles: {srt_path}")
+            all_subtitles = parse_srt_file(srt_path)
         
         # Filter subtitles to only those within the clip timerange
         clip_subtitles = []
@@ -214,46 +347,27 @@ def add_interactive_subtitles_with_timing(video_path, srt_path, clip_path, outpu
         
         print(f"📚 Found {len(clip_subtitles)} subtitle entries within clip timerange")
         
-        # Create subtitle clips with word highlighting
-        subtitle_clips = []
-        for i, sub in enumerate(clip_subtitles):
-            # Only add subtitles that fall within video duration
-            if sub['start'] < video.duration and sub['end'] <= video.duration:
-                # Create background subtitle clips
-                bg_clips = create_subtitle_clip(sub['text'], sub['start'], sub['end'], video_size)
-                subtitle_clips.extend(bg_clips)
-                
-                # Create word highlighting clips
-                highlight_clips = create_word_highlighting_clips(sub['text'], sub['start'], sub['end'], video_size)
-                subtitle_clips.extend(highlight_clips)
-                
-                print(f"✅ Added subtitle {i+1}: {sub['start']:.1f}s - {sub['end']:.1f}s")
-        
-        if not subtitle_clips:
-            print("⚠️  No valid subtitle clips created, saving video without subtitles")
-            video.write_videofile(output_path, codec='libx264', audio_codec='aac')
-            video.close()
+        if not clip_subtitles:
+            print("⚠️  No subtitles found, saving short without subtitles")
+            print(f"💾 Writing final video: {output_path}")
+            encode_video(video_path, output_path, video_filter,
+                         start=clip_start, duration=clip_duration, encoder=encoder)
             return
         
-        # Composite video with subtitles
-        print("🎭 Compositing video with subtitles...")
-        final_video = CompositeVideoClip([video] + subtitle_clips)
+        ass_fd, ass_path = tempfile.mkstemp(suffix='.ass')
+        os.close(ass_fd)
         
-        # Write final video with ULTRA HIGH QUALITY settings
-        print(f"💾 Writing final video: {output_path}")
-        final_video.write_videofile(output_path,
-                                  codec='libx264',
-                                  audio_codec='aac',
-                                  bitrate='8000k',  # Ultra high bitrate for best quality
-                                  audio_bitrate='320k',  # High audio quality
-                                  fps=60,  # High framerate for smooth playback
-                                  preset='slower',  # Best encoding quality
-                                  temp_audiofile='temp-audio.m4a',
-                                  remove_temp=True)
-        
-        # Clean up
-        video.close()
-        final_video.close()
+        try:
+            # Subtitles are laid out for the final short, after crop and scale
+            emit_ass(clip_subtitles, SHORT_SIZE, ass_path)
+            
+            # Trim, crop, scale and burn subtitles in a single ffmpeg decode+filter+encode pass
+            print("🎭 Cropping and burning subtitles into video...")
+            print(f"💾 Writing final video: {output_path}")
+            encode_video(video_path, output_path, f"{video_filter},subtitles={ass_path}",
+                         start=clip_start, duration=clip_duration, encoder=encoder)
+        finally:
+            os.remove(ass_path)
         
         print(f"✅ Interactive subtitles added successfully!")
         
@@ -266,8 +380,17 @@ def add_interactive_subtitles(video_path, srt_path, output_path):
     print(f"🎬 Loading video: {video_path}")
     
     try:
+        # Have ffmpeg downscale oversized sources (e.g. 4K) to the short
+        # resolution while decoding, so compositing touches fewer pixels
+        width, height = get_video_size(video_path)
+        max_side = max(SHORT_SIZE)
+        target_resolution = None
+        if max(width, height) > max_side:
+            # MoviePy takes (height, width); None keeps the aspect ratio
+            target_resolution = (max_side, None) if height >= width else (None, max_side)
+        
         # Load video
-        video = VideoFileClip(video_path)
+        video = VideoFileClip(video_path, target_resolution=target_resolution)
         video_size = video.size
         
         print(f"📊 Video size: {video_size}, Duration: {video.duration:.2f}s")
@@ -278,8 +401,8 @@ def add_interactive_subtitles(video_path, srt_path, output_path):
         
         if not subtitles:
             print("⚠️  No subtitles found, saving video without subtitles")
-            video.write_videofile(output_path, codec='libx264', audio_codec='aac')
             video.close()
+            copy_video(video_path, output_path)
             return
         
         print(f"📚 Found {len(subtitles)} subtitle entries")
@@ -295,8 +418,8 @@ def add_interactive_subtitles(video_path, srt_path, output_path):
         
         if not subtitle_clips:
             print("⚠️  No valid subtitle clips created, saving video without subtitles")
-            video.write_videofile(output_path, codec='libx264', audio_codec='aac')
             video.close()
+            copy_video(video_path, output_path)
             return
         
         # Composite video with subtitles
@@ -324,70 +447,95 @@ def add_interactive_subtitles(video_path, srt_path, output_path):
         print(f"❌ Error processing video: {e}")
         raise
 
-def process_short_video(video_path):
-    """Process a single short video to add interactive subtitles"""
-    video_name = Path(video_path).stem
+def find_source_video(base_name):
+    """Find the downloaded source video for a clip"""
+    for ext in ('mp4', 'mkv', 'avi', 'mov'):
+        video_path = os.path.join(DOWNLOAD_DIR, f"{base_name}.{ext}")
+        if os.path.exists(video_path):
+            return video_path
     
-    # Remove _short suffix to get original name
-    if video_name.endswith('_short'):
-        base_name = video_name[:-6]  # Remove '_short'
-    else:
-        base_name = video_name
+    return None
+
+def process_clip(clip_file, encoder=None):
+    """Create a single short with interactive subtitles from a clip timing file"""
+    # Remove .clip.json suffix to get original name
+    base_name = Path(clip_file).name[:-len('.clip.json')]
     
     print(f"🎯 Processing: {base_name}")
     
+    # Find corresponding source video
+    video_path = find_source_video(base_name)
+    
+    if not video_path:
+        print(f"❌ No video file found for: {base_name}")
+        return
+    
     # Find corresponding SRT file
     srt_file = os.path.join(SUBTITLES_DIR, f"{base_name}.srt")
     
     if not os.path.exists(srt_file):
         print(f"⚠️  SRT file not found: {srt_file}")
-        print("Skipping subtitle overlay...")
-        return
-    
-    # Find corresponding clip timing JSON file
-    clip_file = os.path.join(SUBTITLES_DIR, f"{base_name}.clip.json")
-    
-    if not os.path.exists(clip_file):
-        print(f"⚠️  Clip timing file not found: {clip_file}")
-        print("Skipping subtitle overlay...")
-        return
+        print("Creating short without subtitle overlay...")
+        srt_file = None
     
     # Create output filename
     output_path = os.path.join(SHORTS_DIR, f"{base_name}_with_subtitles.mp4")
     
+    print(f"📁 Video file: {video_path}")
     print(f"📄 SRT file: {srt_file}")
-    print(f"� Clip file: {clip_file}")
-    print(f"�💾 Output: {output_path}")
+    print(f"📋 Clip file: {clip_file}")
+    print(f"💾 Output: {output_path}")
     
-    add_interactive_subtitles_with_timing(video_path, srt_file, clip_file, output_path)
+    add_interactive_subtitles_with_timing(video_path, srt_file, clip_file, output_path, encoder)
 
 def main():
-    """Main function to process all short videos"""
+    """Main function to create all shorts with interactive subtitles"""
     print("🎬 Starting interactive subtitle creation...")
     
     # Note: check_for_packages() removed for compatibility with MoviePy 1.0.3
     
-    if not os.path.exists(SHORTS_DIR):
-        print(f"❌ Shorts directory not found: {SHORTS_DIR}")
+    if not os.path.exists(SUBTITLES_DIR):
+        print(f"❌ Subtitles directory not found: {SUBTITLES_DIR}")
         sys.exit(1)
     
-    # Find all short video files (ending with _short.mp4)
-    short_files = list(Path(SHORTS_DIR).glob("*_short.mp4"))
+    # Shorts are cut straight from the downloaded videos using the clip timing files
+    clip_files = list(Path(SUBTITLES_DIR).glob("*.clip.json"))
     
-    if not short_files:
-        print(f"❌ No short videos found in {SHORTS_DIR}")
-        print("Please run create_short.sh first")
+    if not clip_files:
+        print(f"❌ No clip.json files found in {SUBTITLES_DIR}")
+        print("Please run suggest_clip.py first")
         sys.exit(1)
     
-    print(f"🎥 Found {len(short_files)} short videos to process")
+    os.makedirs(SHORTS_DIR, exist_ok=True)
     
-    for video_file in short_files:
-        try:
-            process_short_video(str(video_file))
-            print("-" * 60)
-        except Exception as e:
-            print(f"❌ Failed to process {video_file}: {e}")
-            continue
+    print(f"🎥 Found {len(clip_files)} clips to process")
+    
+    # Probe once here and hand the choice to every worker, so they don't re-probe
+    encoder = detect_video_encoder()
+    print(f"🚀 Using {encoder['name']} encoding")
+    
+    # Each ffmpeg encode is already multithreaded, so only use half the cores
+    max_workers = max(1, min((os.cpu_count() or 2) // 2, len(clip_files)))
+    
+    # Extra NVENC sessions beyond the driver limit fail to open
+    if encoder['max_sessions']:
+        max_workers = min(max_workers, encoder['max_sessions'])
+    print(f"⚙️  Processing with {max_workers} parallel workers")
+    
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(process_clip, str(clip_file), encoder): clip_file
+            for clip_file in clip_files
+        }
+        
+        for future in as_completed(futures):
+            clip_file = futures[future]
+            try:
+                future.result()
+                print("-" * 60)
+            except Exception as e:
+                print(f"❌ Failed to process {clip_file}: {e}")
+                continue
     
     print("🎉 Interactive subtitle creation complete!")
     print(f"📁 Check output in: {SHORTS_DIR}")
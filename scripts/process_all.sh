@@ -94,23 +94,17 @@ else
     exit 1
 fi
 
-# Step 5: Create short
-log "✂️  Step 5: Creating smart short video clips (9:16 format)..."
-if bash create_smart_short.sh; then
-    success "Smart short videos created successfully"
+# Step 5: Create shorts with interactive subtitles
+# Trim, 9:16 crop and subtitle burn-in run as a single ffmpeg pass,
+# so no intermediate *_short.mp4 is written
+log "🎭 Step 5: Creating 9:16 shorts with interactive subtitles..."
+if ./run_python.sh create_interactive_subtitles.py; then
+    success "Shorts with interactive subtitles created successfully"
 else
     error "Failed to create short videos"
     exit 1
 fi
 
-# Step 6: Add interactive subtitles
-log "🎭 Step 6: Adding interactive subtitles..."
-if ./run_python.sh create_interactive_subtitles.py; then
-    success "Interactive subtitles added successfully"
-else
-    warning "Failed to add interactive subtitles, short videos available without subtitles"
-fi
-
 # Final summary
 log "📊 Processing complete! Summary:"
 echo "----------------------------------------"
@@ -120,14 +114,12 @@ download_count=$(ls -1 "$DOWNLOAD_DIR"/*.mp4 2>/dev/null | wc -l || echo "0")
 subtitle_count=$(ls -1 "$SUBTITLES_DIR"/*.txt 2>/dev/null | wc -l || echo "0")
 srt_count=$(ls -1 "$SUBTITLES_DIR"/*.srt 2>/dev/null | wc -l || echo "0")
 clip_count=$(ls -1 "$SUBTITLES_DIR"/*.clip.json 2>/dev/null | wc -l || echo "0")
-short_count=$(ls -1 "$SHORTS_DIR"/*_short.mp4 2>/dev/null | wc -l || echo "0")
 final_count=$(ls -1 "$SHORTS_DIR"/*_with_subtitles.mp4 2>/dev/null | wc -l || echo "0")
 
 echo "📥 Downloaded videos: $download_count"
 echo "📝 Text transcripts: $subtitle_count"
 echo "🎬 SRT subtitles: $srt_count"
 echo "🎯 Clip suggestions: $clip_count"
-echo "✂️  Short clips: $short_count"
 echo "🎭 Final videos with subtitles: $final_count"
 
 echo "----------------------------------------"
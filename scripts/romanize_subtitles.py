@@ -8,10 +8,12 @@ Usage: python3 romanize_subtitles.py
 
 import os
 import sys
-import json
 import requests
 import re
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -25,20 +27,36 @@ if not OPENROUTER_API_KEY:
     sys.exit(1)
 MODEL_NAME = "deepseek/deepseek-chat"  # DeepSeek v3 (free) model
 SUBTITLES_DIR = os.path.expanduser("~/automation/subtitles")
+MAX_WORKERS = 8
+BATCH_MAX_FILES = 16  # Files romanized together in one API call
+BATCH_MAX_CHARS = 8000  # Keep batched replies within the max_tokens budget
+
+# Section markers used to split batched romanization replies; the index
+# is captured so each section can be matched back to its file
+_BOUNDARY_RE = re.compile(r'\s*---FILE_BOUNDARY_(\d+)---\s*')
+
+# Shared session so concurrent requests reuse pooled TLS connections
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=MAX_WORKERS, pool_maxsize=MAX_WORKERS))
 
 def detect_language(text):
     """Simple language detection based on script"""
-    # Check for Urdu/Hindi/Arabic scripts
-    urdu_hindi_chars = set('آابپتٹثجچحخدڈذرڑزژسشصضطظعغفقکگلمنوہھءیےअआइईउऊएऐओऔकखगघचछजझञटठडढणतथदधनपफबभमयरलवशषसहक्षत्रज्ञ')
+    codepoints = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
     
-    char_count = 0
-    urdu_hindi_count = 0
+    # Check for Urdu/Arabic (U+0600-06FF) and Hindi/Devanagari (U+0900-097F) scripts
+    script_mask = (((codepoints >= 0x0600) & (codepoints <= 0x06FF)) |
+                   ((codepoints >= 0x0900) & (codepoints <= 0x097F)))
     
-    for char in text:
-        if char.isalpha():
-            char_count += 1
-            if char in urdu_hindi_chars:
-                urdu_hindi_count += 1
+    # Approximate str.isalpha(): ASCII letters plus non-ASCII characters
+    # outside the general punctuation/symbol and CJK punctuation blocks
+    folded = codepoints | 0x20
+    ascii_letters = (codepoints < 0x80) & (folded >= 0x61) & (folded <= 0x7A)
+    other_letters = ((codepoints >= 0xC0) &
+                     ~((codepoints >= 0x2000) & (codepoints <= 0x2BFF)) &
+                     ~((codepoints >= 0x3000) & (codepoints <= 0x303F)))
+    
+    char_count = int((ascii_letters | other_letters).sum())
+    urdu_hindi_count = int(script_mask.sum())
     
     if char_count == 0:
         return "unknown"
@@ -49,8 +67,8 @@ def detect_language(text):
     else:
         return "english"
 
-def romanize_text_with_api(text):
-    """Romanize text using OpenRouter API"""
+def call_openrouter_api(prompt, timeout=30):
+    """Send a single prompt to the OpenRouter API and return the reply text"""
     url = "https://openrouter.ai/api/v1/chat/completions"
     
     headers = {
@@ -58,13 +76,6 @@ def romanize_text_with_api(text):
         "Content-Type": "application/json"
     }
     
-    prompt = f"""Please romanize the following Urdu/Hindi text into Roman script (English letters). 
-Keep the meaning intact and use commonly accepted romanization conventions.
-Only return the romanized text, nothing else.
-
-Text to romanize:
-{text}"""
-    
     data = {
         "model": MODEL_NAME,
         "messages": [
@@ -75,19 +86,60 @@ Text to romanize:
     }
     
     try:
-        response = requests.post(url, headers=headers, json=data, timeout=30)
+        response = SESSION.post(url, headers=headers, json=data, timeout=timeout)
         response.raise_for_status()
         
         result = response.json()
-        romanized_text = result["choices"][0]["message"]["content"].strip()
-        return romanized_text
+        return result["choices"][0]["message"]["content"].strip()
         
     except Exception as e:
         print(f"❌ Error calling OpenRouter API: {e}")
         return None
 
-def process_subtitle_file(file_path):
-    """Process a single subtitle file"""
+def romanize_text_with_api(text):
+    """Romanize text using OpenRouter API"""
+    prompt = f"""Please romanize the following Urdu/Hindi text into Roman script (English letters). 
+Keep the meaning intact and use commonly accepted romanization conventions.
+Only return the romanized text, nothing else.
+
+Text to romanize:
+{text}"""
+    
+    return call_openrouter_api(prompt)
+
+def romanize_batch_with_api(texts):
+    """Romanize several texts with one OpenRouter API call, or None if the reply can't be split"""
+    sections = '\n'.join(f"---FILE_BOUNDARY_{i}---\n{text}" for i, text in enumerate(texts))
+    
+    prompt = f"""Please romanize each of the following Urdu/Hindi text sections into Roman script (English letters). 
+Keep the meaning intact and use commonly accepted romanization conventions.
+Each section starts with a boundary marker line such as ---FILE_BOUNDARY_0---.
+Keep every boundary marker exactly as it is and in the same order.
+Only return the boundary markers and the romanized sections, nothing else.
+
+Sections to romanize:
+{sections}"""
+    
+    # A batched reply takes longer to generate than a single file's
+    romanized = call_openrouter_api(prompt, timeout=30 * len(texts))
+    if not romanized:
+        return None
+    
+    # split() yields [preamble, index 0, text 0, index 1, text 1, ...]
+    parts = _BOUNDARY_RE.split(romanized)
+    if parts[0].strip():
+        return None
+    
+    # Only trust the reply if every marker came back once, in order, since
+    # the sections overwrite the original files
+    indices = parts[1::2]
+    if indices != [str(i) for i in range(len(texts))]:
+        return None
+    
+    return [part.strip() for part in parts[2::2]]
+
+def load_subtitle_file(file_path):
+    """Read a subtitle file and return its content if it needs romanization"""
     print(f"📄 Processing: {file_path}")
     
     try:
@@ -96,29 +148,72 @@ def process_subtitle_file(file_path):
         
         if not content:
             print(f"⚠️  File is empty: {file_path}")
-            return
+            return None
         
         # Detect language
         language = detect_language(content)
         print(f"🔍 Detected language: {language}")
         
-        if language == "urdu_hindi":
-            print("🔄 Romanizing text...")
-            romanized_content = romanize_text_with_api(content)
-            
-            if romanized_content:
-                # Save romanized version
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(romanized_content)
-                print(f"✅ Romanized and saved: {file_path}")
-            else:
-                print(f"❌ Failed to romanize: {file_path}")
-        else:
+        if language != "urdu_hindi":
             print(f"ℹ️  No romanization needed for: {file_path}")
-            
+            return None
+        
+        return content
+        
+    except Exception as e:
+        print(f"❌ Error processing {file_path}: {e}")
+        return None
+
+def save_romanized_file(file_path, romanized_content):
+    """Overwrite a subtitle file with its romanized version"""
+    if not romanized_content:
+        print(f"❌ Failed to romanize: {file_path}")
+        return
+    
+    try:
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(romanized_content)
+        print(f"✅ Romanized and saved: {file_path}")
+        
     except Exception as e:
         print(f"❌ Error processing {file_path}: {e}")
 
+def process_subtitle_batch(batch):
+    """Romanize a batch of (file_path, content) pairs with as few API calls as possible"""
+    if len(batch) == 1:
+        print("🔄 Romanizing text...")
+        romanized = [romanize_text_with_api(batch[0][1])]
+    else:
+        print(f"🔄 Romanizing {len(batch)} files in one request...")
+        romanized = romanize_batch_with_api([content for _, content in batch])
+    
+    if romanized is None:
+        print("⚠️  Could not split batched response, romanizing files one by one")
+        romanized = [romanize_text_with_api(content) for _, content in batch]
+    
+    for (file_path, _), romanized_content in zip(batch, romanized):
+        save_romanized_file(file_path, romanized_content)
+
+def make_batches(files):
+    """Group (file_path, content) pairs into batches bounded by file count and size"""
+    batches = []
+    current = []
+    current_chars = 0
+    
+    for file_path, content in files:
+        if current and (len(current) == BATCH_MAX_FILES or current_chars + len(content) > BATCH_MAX_CHARS):
+            batches.append(current)
+            current = []
+            current_chars = 0
+        
+        current.append((file_path, content))
+        current_chars += len(content)
+    
+    if current:
+        batches.append(current)
+    
+    return batches
+
 def main():
     """Main function to process all subtitle files"""
     print("🌐 Starting subtitle romanization...")
@@ -136,8 +231,21 @@ def main():
     
     print(f"📚 Found {len(txt_files)} subtitle files to process")
     
+    # Only files detected as Urdu/Hindi need an API call
+    pending = []
     for txt_file in txt_files:
-        process_subtitle_file(str(txt_file))
+        content = load_subtitle_file(str(txt_file))
+        if content:
+            pending.append((str(txt_file), content))
+    
+    if pending:
+        # Several files share one request to amortize per-call overhead,
+        # and the batches are bound by API latency, so run them concurrently
+        batches = make_batches(pending)
+        print(f"📦 Romanizing {len(pending)} files in {len(batches)} requests")
+        
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            list(executor.map(process_subtitle_batch, batches))
     
     print("🎉 Romanization complete!")
 
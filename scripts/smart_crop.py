@@ -10,10 +10,83 @@ import cv2
 import numpy as np
 import sys
 import os
+import functools
+import subprocess
+
+# Configuration
+MODELS_DIR = os.path.expanduser("~/automation/models")
+FACE_PROTOTXT = os.path.join(MODELS_DIR, "deploy.prototxt")
+FACE_MODEL = os.path.join(MODELS_DIR, "res10_300x300_ssd_iter_140000.caffemodel")
+FACE_BATCH_SIZE = 16
+FACE_CONFIDENCE = 0.5
+HAAR_DETECT_WIDTH = 320
+
+# Parsed once at import instead of re-reading the cascade XML on every call
+_FACE_CASCADE = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+
+@functools.lru_cache(maxsize=1)
+def load_face_net():
+    """Load the SSD face detector on the CUDA backend, or None if the model is missing"""
+    if not (os.path.exists(FACE_PROTOTXT) and os.path.exists(FACE_MODEL)):
+        return None
+    
+    net = cv2.dnn.readNetFromCaffe(FACE_PROTOTXT, FACE_MODEL)
+    # OpenCV falls back to the CPU backend if it was built without CUDA
+    net.setPreferableBackend(cv2.dnn.DNN_BACKEND_CUDA)
+    net.setPreferableTarget(cv2.dnn.DNN_TARGET_CUDA)
+    return net
+
+def detect_faces_batch(net, frames):
+    """Run the SSD detector once over a batch of frames and return (center_x, center_y, area) of the largest face per frame"""
+    blob = cv2.dnn.blobFromImages(frames, 1.0, (300, 300), (104, 177, 123))
+    net.setInput(blob)
+    
+    # Each detection row is [image_id, label, confidence, x1, y1, x2, y2]
+    detections = net.forward().reshape(-1, 7)
+    detections = detections[detections[:, 2] > FACE_CONFIDENCE]
+    
+    face_positions = []
+    for i, frame in enumerate(frames):
+        faces = detections[detections[:, 0] == i]
+        if len(faces) == 0:
+            continue
+        
+        # Boxes are normalized to [0, 1]; scale back to frame pixels
+        height, width = frame.shape[:2]
+        boxes = faces[:, 3:7] * np.array([width, height, width, height])
+        areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+        
+        # Use the largest face
+        largest = np.argmax(areas)
+        x1, y1, x2, y2 = boxes[largest]
+        face_positions.append(((x1 + x2) / 2, (y1 + y2) / 2, areas[largest]))
+    
+    return face_positions
+
+def detect_face_haar(frame):
+    """Detect the largest face in a frame with a Haar cascade and return (center_x, center_y, area)"""
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    
+    # Detect on a small copy; only the face position matters, and the
+    # cascade cost grows with the number of pixels scanned
+    height, width = gray.shape
+    scale = min(1.0, HAAR_DETECT_WIDTH / width)
+    small = cv2.resize(gray, (int(width * scale), int(height * scale)), interpolation=cv2.INTER_AREA)
+    faces = _FACE_CASCADE.detectMultiScale(small, 1.1, 4, minSize=(20, 20))
+    
+    if len(faces) == 0:
+        return None
+    
+    # Use the largest face, scaled back to full-frame coordinates
+    largest_face = max(faces, key=lambda x: x[2] * x[3])
+    x, y, w, h = largest_face
+    return ((x + w / 2) / scale, (y + h / 2) / scale, (w * h) / (scale * scale))
 
 def detect_faces_in_video(video_path, start_frame=0, end_frame=None):
     """Detect faces in video and return average position"""
-    face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+    # Prefer the batched DNN detector, fall back to the Haar cascade
+    net = load_face_net()
+    
     cap = cv2.VideoCapture(video_path)
     
     if not cap.isOpened():
@@ -23,50 +96,92 @@ def detect_faces_in_video(video_path, start_frame=0, end_frame=None):
     if end_frame is None:
         end_frame = total_frames
     
-    face_positions = []
+    sample_interval = 30
+    sample_frames = range(start_frame, min(end_frame, total_frames), sample_interval)
+    
+    # One row per detected face: center x, center y and face area
+    face_positions = np.empty((len(sample_frames), 3), dtype=np.float64)
+    face_count = 0
+    batch = []
     frame_count = 0
     
+    # Advance to the start frame with sequential grabs; seeking with
+    # CAP_PROP_POS_FRAMES rewinds to a keyframe and re-decodes every time
+    for _ in range(start_frame):
+        if not cap.grab():
+            break
+    
     # Sample every 30th frame for performance
-    for frame_num in range(start_frame, min(end_frame, total_frames), 30):
-        cap.set(cv2.CAP_PROP_POS_FRAMES, frame_num)
+    for frame_num in sample_frames:
         ret, frame = cap.read()
         
         if not ret:
             break
-            
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        faces = face_cascade.detectMultiScale(gray, 1.1, 4)
         
-        if len(faces) > 0:
-            # Use the largest face
-            largest_face = max(faces, key=lambda x: x[2] * x[3])
-            x, y, w, h = largest_face
-            center_x = x + w // 2
-            center_y = y + h // 2
-            face_positions.append((center_x, center_y))
+        if net is not None:
+            # Collect frames and run the detector once per batch
+            batch.append(frame)
+            if len(batch) == FACE_BATCH_SIZE:
+                for face in detect_faces_batch(net, batch):
+                    face_positions[face_count] = face
+                    face_count += 1
+                batch = []
+        else:
+            face = detect_face_haar(frame)
+            if face:
+                face_positions[face_count] = face
+                face_count += 1
         
         frame_count += 1
+        
+        # grab() decodes without converting to a BGR image, so skipping
+        # frames this way is much cheaper than reading them
+        for _ in range(sample_interval - 1):
+            if not cap.grab():
+                break
     
     cap.release()
     
-    if face_positions:
-        # Return average face position
-        avg_x = sum(pos[0] for pos in face_positions) // len(face_positions)
-        avg_y = sum(pos[1] for pos in face_positions) // len(face_positions)
-        return (avg_x, avg_y)
+    if batch:
+        for face in detect_faces_batch(net, batch):
+            face_positions[face_count] = face
+            face_count += 1
+    
+    if face_count:
+        # Return average face position, weighted by face area so that
+        # close-ups of the main subject count more than background faces
+        positions = face_positions[:face_count]
+        weights = np.maximum(positions[:, 2], 1.0)
+        avg_x, avg_y = np.average(positions[:, :2], axis=0, weights=weights)
+        return (int(avg_x), int(avg_y))
     
     return None
 
-def calculate_smart_crop(video_path, target_width=1080, target_height=1920):
-    """Calculate optimal crop position for 9:16 format"""
-    cap = cv2.VideoCapture(video_path)
+def get_video_size(video_path):
+    """Get (width, height) of the first video stream using ffprobe, or None if unreadable"""
+    try:
+        output = subprocess.check_output([
+            'ffprobe', '-v', 'error',
+            '-select_streams', 'v:0',
+            '-show_entries', 'stream=width,height',
+            '-of', 'csv=p=0',
+            video_path
+        ], text=True)
+        width, height = output.strip().split(',')[:2]
+        return int(width), int(height)
+    except (OSError, subprocess.CalledProcessError, ValueError):
+        return None
+
+@functools.lru_cache(maxsize=None)
+def calculate_smart_crop_params(video_path, target_width=1080, target_height=1920):
+    """Calculate optimal crop for 9:16 format as an (x, y, width, height) tuple"""
+    # Read dimensions with ffprobe so only the face detector opens a decoder
+    video_size = get_video_size(video_path)
     
-    if not cap.isOpened():
-        return "crop=1080:1920:420:0"  # Default center crop
+    if video_size is None:
+        return (420, 0, 1080, 1920)  # Default center crop
     
-    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-    cap.release()
+    width, height = video_size
     
     print(f"Original video: {width}x{height}")
     
@@ -86,7 +201,12 @@ def calculate_smart_crop(video_path, target_width=1080, target_height=1920):
         crop_x = max(0, (width - target_width) // 2)
         crop_y = max(0, (height - target_height) // 2)
     
-    return f"crop={target_width}:{target_height}:{crop_x}:{crop_y}"
+    return (crop_x, crop_y, target_width, target_height)
+
+def calculate_smart_crop(video_path, target_width=1080, target_height=1920):
+    """Calculate optimal crop position for 9:16 format as an ffmpeg crop filter string"""
+    crop_x, crop_y, crop_width, crop_height = calculate_smart_crop_params(video_path, target_width, target_height)
+    return f"crop={crop_width}:{crop_height}:{crop_x}:{crop_y}"
 
 if __name__ == "__main__":
     if len(sys.argv) != 2:
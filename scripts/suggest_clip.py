@@ -3,13 +3,19 @@
 """
 suggest_clip.py
 Analyzes romanized transcripts and suggests viral/important clip segments using OpenRouter API
-Usage: python3 suggest_clip.py
+Usage: python3 suggest_clip.py [--force]
 """
 
 import os
 import sys
 import json
-import requests
+import asyncio
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import re
+import aiohttp
+import orjson
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -25,84 +31,277 @@ if not OPENROUTER_API_KEY:
 
 MODEL_NAME = "deepseek/deepseek-chat"  # DeepSeek v3 (free) model
 SUBTITLES_DIR = os.path.expanduser("~/automation/subtitles")
+OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
+MAX_CONCURRENT_REQUESTS = 10
+MAX_TRANSCRIPT_CHARS = 40_000  # Longer transcripts are sent as head + tail
 
-def suggest_clip_with_api(transcript):
-    """Use OpenRouter API to suggest a clip segment"""
-    url = "https://openrouter.ai/api/v1/chat/completions"
+# Opt-in batching of several transcripts per request (CLIP_BATCH=1); each
+# transcript gets an equal share of MAX_TRANSCRIPT_CHARS
+BATCH_ENABLED = os.getenv("CLIP_BATCH") == "1"
+BATCH_SIZE = 4
+
+CLIP_CRITERIA = """Look for:
+- Emotional moments
+- Key insights or revelations
+- Funny or surprising content
+- Actionable advice
+- Dramatic moments
+- Quotable statements"""
+
+# Fixed part of the single-transcript prompt, built once; the transcript is appended per call
+_PROMPT_PREFIX = f"""Analyze the following video transcript and suggest ONE short clip segment (30-90 seconds) that would be most viral or engaging for social media.
+
+Please provide your response in this exact JSON format:
+{{
+    "start": "HH:MM:SS",
+    "end": "HH:MM:SS",
+    "reason": "Brief explanation why this segment is viral/engaging"
+}}
+
+{CLIP_CRITERIA}
+
+Transcript:
+"""
+
+# Request fields shared by every call; each request adds its own messages
+_REQUEST_TEMPLATE = {
+    "model": MODEL_NAME,
+    "max_tokens": 500,
+    "temperature": 0.3
+}
+
+# Start of an SRT timestamp line (HH:MM:SS,mmm --> HH:MM:SS,mmm)
+_TS_RE = re.compile(r'^\d{2}:\d{2}:\d{2}')
+
+# Clip timestamp as [[HH:]MM:]SS
+_HMS_RE = re.compile(r'^(?:(?:(\d+):)?(\d+):)?(\d+)$')
+
+# JSON object or list inside a ```json fenced block of a model reply
+_FENCE_RE = re.compile(r'```(?:json)?\s*([\[{].*?[\]}])\s*```', re.DOTALL)
+_JSON_DECODER = json.JSONDecoder()
+
+# Opt-in cache of API responses for reruns over unchanged transcripts (CLIP_CACHE=1)
+CACHE_ENABLED = os.getenv("CLIP_CACHE") == "1"
+CACHE_DIR = Path("~/automation/.clip_cache").expanduser()
+
+# The API key is fixed for the run, so the headers are built once
+HEADERS = {
+    "Authorization": f"Bearer {OPENROUTER_API_KEY}",
+    "Content-Type": "application/json"
+}
+
+# Rate limits, server errors and dropped connections are retried with
+# exponential backoff, honoring the Retry-After header when OpenRouter sends one
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+MAX_RETRIES = 5
+RETRY_BACKOFF = 1.0
+
+def truncate_transcript(transcript, max_chars=MAX_TRANSCRIPT_CHARS):
+    """Keep the head and tail of very long transcripts so the prompt stays within context limits"""
+    if len(transcript) <= max_chars:
+        return transcript
+    
+    half = max_chars // 2
+    return transcript[:half] + "\n...[middle omitted]...\n" + transcript[-half:]
+
+def build_request_data(transcript):
+    """Build the OpenRouter chat completion request for a transcript"""
+    prompt = _PROMPT_PREFIX + truncate_transcript(transcript)
     
-    headers = {
-        "Authorization": f"Bearer {OPENROUTER_API_KEY}",
-        "Content-Type": "application/json"
+    return {
+        **_REQUEST_TEMPLATE,
+        "messages": [
+            {"role": "user", "content": prompt}
+        ]
     }
+
+def build_batch_request_data(file_names, transcripts):
+    """Build one OpenRouter request asking for a clip suggestion per transcript"""
+    # Split the single-file budget between the transcripts in the batch
+    max_chars = MAX_TRANSCRIPT_CHARS // len(transcripts)
+    sections = '\n\n'.join(
+        f"--- FILE {i}: {name} ---\n{truncate_transcript(transcript, max_chars)}"
+        for i, (name, transcript) in enumerate(zip(file_names, transcripts))
+    )
     
-    prompt = f"""Analyze the following video transcript and suggest ONE short clip segment (30-90 seconds) that would be most viral or engaging for social media.
+    prompt = f"""Analyze each of the following {len(transcripts)} video transcripts and suggest ONE short clip segment (30-90 seconds) per transcript that would be most viral or engaging for social media.
 
-Please provide your response in this exact JSON format:
+Please provide your response as a JSON array with exactly {len(transcripts)} objects, one per transcript in the same order as the files, each in this exact format:
 {{
     "start": "HH:MM:SS",
     "end": "HH:MM:SS",
     "reason": "Brief explanation why this segment is viral/engaging"
 }}
 
-Look for:
-- Emotional moments
-- Key insights or revelations
-- Funny or surprising content
-- Actionable advice
-- Dramatic moments
-- Quotable statements
+{CLIP_CRITERIA}
 
-Transcript:
-{transcript}"""
+{sections}"""
     
-    data = {
-        "model": MODEL_NAME,
+    return {
+        **_REQUEST_TEMPLATE,
         "messages": [
             {"role": "user", "content": prompt}
         ],
-        "max_tokens": 500,
-        "temperature": 0.3
+        "max_tokens": _REQUEST_TEMPLATE["max_tokens"] * len(transcripts)
     }
+
+def extract_json(text, expected_type=dict):
+    """Return the first JSON object (or list) embedded in a model reply, or None"""
+    # Prefer a fenced ```json block when the model used one
+    match = _FENCE_RE.search(text)
+    if match:
+        try:
+            value = orjson.loads(match.group(1))
+            if isinstance(value, expected_type):
+                return value
+        except orjson.JSONDecodeError:
+            pass
     
-    try:
-        response = requests.post(url, headers=headers, json=data, timeout=30)
-        response.raise_for_status()
-        
-        result = response.json()
-        suggestion_text = result["choices"][0]["message"]["content"].strip()
+    # Otherwise try decoding from each opening bracket, ignoring surrounding prose
+    opener = '{' if expected_type is dict else '['
+    idx = text.find(opener)
+    while idx != -1:
+        try:
+            value, _ = _JSON_DECODER.raw_decode(text, idx)
+            if isinstance(value, expected_type):
+                return value
+        except ValueError:
+            pass
+        idx = text.find(opener, idx + 1)
+    
+    return None
+
+def parse_batch_suggestions(result, count):
+    """Extract the list of clip suggestions from a batched API response, or None if it doesn't fit"""
+    suggestion_text = result["choices"][0]["message"]["content"].strip()
+    
+    suggestions = extract_json(suggestion_text, list)
+    if suggestions is None or len(suggestions) != count:
+        return None
+    
+    # Anything but one object per file falls back to per-file requests
+    if not all(isinstance(suggestion, dict) for suggestion in suggestions):
+        return None
+    
+    return suggestions
+
+def parse_suggestion(result):
+    """Extract the clip suggestion JSON from an OpenRouter API response"""
+    suggestion_text = result["choices"][0]["message"]["content"].strip()
+    
+    suggestion = extract_json(suggestion_text)
+    if suggestion is None:
+        print(f"❌ Could not parse JSON from API response: {suggestion_text}")
+    return suggestion
+
+async def post_with_retry_async(session, data, timeout):
+    """POST a request to OpenRouter and return the decoded response, retrying rate limits, server and connection errors"""
+    body = orjson.dumps(data)
+    
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            async with session.post(OPENROUTER_URL,
+                                    headers=HEADERS,
+                                    data=body,
+                                    timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                if response.status not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                    response.raise_for_status()
+                    return orjson.loads(await response.read())
+                
+                retry_after = response.headers.get("Retry-After", "")
+                problem = f"OpenRouter returned {response.status}"
+        except aiohttp.ClientConnectionError as e:
+            if attempt == MAX_RETRIES:
+                raise
+            retry_after = ""
+            problem = f"Connection to OpenRouter failed ({e})"
         
-        # Try to extract JSON from the response
-        start_idx = suggestion_text.find('{')
-        end_idx = suggestion_text.rfind('}') + 1
+        # Release the connection before waiting
+        delay = float(retry_after) if retry_after.isdigit() else RETRY_BACKOFF * 2 ** attempt
+        print(f"⏳ {problem}, retrying in {delay:g}s...")
+        await asyncio.sleep(delay)
+
+async def suggest_clips_batch_async(session, file_names, transcripts):
+    """Ask for clip suggestions for several transcripts in one API call"""
+    data = build_batch_request_data(file_names, transcripts)
+    
+    try:
+        result = await post_with_retry_async(session, data, 30 * len(transcripts))
+        return parse_batch_suggestions(result, len(transcripts))
         
-        if start_idx != -1 and end_idx != -1:
-            json_str = suggestion_text[start_idx:end_idx]
-            suggestion = json.loads(json_str)
-            return suggestion
-        else:
-            print(f"❌ Could not parse JSON from API response: {suggestion_text}")
-            return None
+    except (aiohttp.ClientError, asyncio.TimeoutError, json.JSONDecodeError, KeyError, IndexError) as e:
+        print(f"❌ Error calling OpenRouter API: {e}")
+        return None
+
+def get_cache_path(transcript):
+    """Return the cache file for a transcript, keyed by model, temperature and single-file prompt"""
+    # Batched runs use the same key, so cache entries don't depend on how files were grouped
+    data = build_request_data(transcript)
+    prompt = data["messages"][0]["content"]
+    key = hashlib.sha256(f"{data['model']}|{data['temperature']}|{prompt}".encode('utf-8')).hexdigest()
+    return CACHE_DIR / f"{key}.json"
+
+def load_cached_suggestion(transcript):
+    """Return a previously cached suggestion for this transcript, if caching is enabled"""
+    if not CACHE_ENABLED:
+        return None
+    
+    cache_path = get_cache_path(transcript)
+    if not cache_path.exists():
+        return None
+    
+    try:
+        suggestion = orjson.loads(cache_path.read_bytes())
+    except (OSError, ValueError):
+        return None
+    
+    print("💾 Using cached clip suggestion")
+    return suggestion
+
+def store_cached_suggestion(transcript, suggestion):
+    """Cache a validated suggestion for this transcript, if caching is enabled"""
+    if not CACHE_ENABLED or not suggestion:
+        return
+    
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    get_cache_path(transcript).write_bytes(orjson.dumps(suggestion))
+
+async def suggest_clip_with_api_async(session, transcript):
+    """Use OpenRouter API to suggest a clip segment without blocking the event loop"""
+    data = build_request_data(transcript)
+    
+    try:
+        result = await post_with_retry_async(session, data, 30)
+        return parse_suggestion(result)
         
-    except Exception as e:
+    except (aiohttp.ClientError, asyncio.TimeoutError, json.JSONDecodeError, KeyError, IndexError) as e:
+        # No .clip.json is written, so the next run picks this file up again
         print(f"❌ Error calling OpenRouter API: {e}")
         return None
 
 def convert_time_to_seconds(time_str):
-    """Convert HH:MM:SS to seconds"""
-    parts = time_str.split(':')
-    if len(parts) == 3:
-        hours, minutes, seconds = map(int, parts)
-        return hours * 3600 + minutes * 60 + seconds
-    elif len(parts) == 2:
-        minutes, seconds = map(int, parts)
-        return minutes * 60 + seconds
-    else:
-        return int(parts[0])
+    """Convert HH:MM:SS (or MM:SS, or SS) to seconds"""
+    match = _HMS_RE.match(str(time_str).strip())
+    if not match:
+        raise ValueError(f"Invalid timestamp format: {time_str}")
+    
+    hours, minutes, seconds = (int(group) if group else None for group in match.groups())
+    
+    # Reject out-of-range fields such as 99:99:99
+    if minutes is not None and seconds >= 60:
+        raise ValueError(f"Seconds out of range in timestamp: {time_str}")
+    if hours is not None and minutes >= 60:
+        raise ValueError(f"Minutes out of range in timestamp: {time_str}")
+    
+    return (hours or 0) * 3600 + (minutes or 0) * 60 + seconds
 
 def validate_timestamps(start_time, end_time):
     """Validate that timestamps are reasonable"""
-    start_seconds = convert_time_to_seconds(start_time)
-    end_seconds = convert_time_to_seconds(end_time)
+    try:
+        start_seconds = convert_time_to_seconds(start_time)
+        end_seconds = convert_time_to_seconds(end_time)
+    except ValueError as e:
+        return False, str(e)
     
     if start_seconds >= end_seconds:
         return False, "Start time must be before end time"
@@ -116,94 +315,229 @@ def validate_timestamps(start_time, end_time):
     
     return True, "Valid"
 
-def extract_text_from_srt(srt_content):
-    """Extract just the text content from SRT format"""
-    import re
+def iter_srt_lines(lines):
+    """Yield the subtitle text lines from an iterable of SRT lines"""
+    # Walk the lines once: each block is a sequence number, a timestamp
+    # line and then text lines until a blank line
+    state = 'index'
+    for line in lines:
+        # A UTF-8 BOM before the first sequence number would stop it matching isdigit()
+        line = line.lstrip('\ufeff').strip()
+        
+        if not line:
+            state = 'index'
+            continue
+        
+        if state == 'index' and line.isdigit():
+            state = 'timestamp'
+            continue
+        
+        if state in ('index', 'timestamp') and _TS_RE.match(line):
+            state = 'text'
+            continue
+        
+        state = 'text'
+        yield line
+
+def iter_srt_text(file_path):
+    """Stream the text lines of an SRT file without loading the whole file"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        yield from iter_srt_lines(f)
+
+def get_clip_file(file_path):
+    """Return the clip suggestion JSON path for a transcript file"""
+    base_name = Path(file_path).stem
+    return os.path.join(SUBTITLES_DIR, f"{base_name}.clip.json")
+
+def load_transcript(file_path):
+    """Read a transcript file and return (text, status message); text is None if it can't be analyzed"""
+    # Runs in a worker process, so status messages are returned for the caller to print
+    
+    # Reject tiny files from their size alone, before opening them
+    try:
+        size = os.stat(file_path).st_size
+    except OSError as e:
+        return None, f"❌ Error processing {file_path}: {e}"
+    
+    if size == 0:
+        return None, f"⚠️  File is empty: {file_path}"
     
-    # Split by double newlines to get subtitle blocks
-    blocks = re.split(r'\n\s*\n', srt_content.strip())
-    text_lines = []
+    # Same case-insensitive suffix test as the directory scan in main()
+    is_srt = Path(file_path).suffix.lower() == '.srt'
     
-    for block in blocks:
-        lines = block.strip().split('\n')
-        if len(lines) >= 3:
-            # Skip sequence number and timestamp, get text (lines 2+)
-            text = ' '.join(lines[2:]).strip()
-            if text:
-                text_lines.append(text)
+    # A 100 character transcript needs at least 100 bytes; an SRT file also
+    # holds at least one cue number and timestamp line (~30 bytes)
+    min_size = 130 if is_srt else 100
+    if size < min_size:
+        return None, f"⚠️  Transcript too short for analysis: {file_path}"
     
-    return ' '.join(text_lines)
+    # Check if this is an SRT file and extract text content
+    message = None
+    if is_srt:
+        message = "📝 Processed SRT file - extracted text content"
+        transcript = ' '.join(iter_srt_text(file_path))
+    else:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            transcript = f.read().strip()
+    
+    if not transcript:
+        return None, f"⚠️  No text content found in: {file_path}"
+    
+    if len(transcript) < 100:
+        return None, f"⚠️  Transcript too short for analysis: {file_path}"
+    
+    return transcript, message
 
-def process_transcript_file(file_path):
-    """Process a single transcript file and generate clip suggestion"""
+async def load_transcript_async(file_path, pool):
+    """Load a transcript in a worker process and print its status under the file's header"""
+    loop = asyncio.get_running_loop()
+    try:
+        # Parsing in a worker process overlaps other files' API waits
+        transcript, message = await loop.run_in_executor(pool, load_transcript, file_path)
+    except Exception as e:
+        transcript, message = None, f"❌ Error processing {file_path}: {e}"
+    
+    # Print from the parent once loading is done, so each file's lines stay together
     print(f"📄 Processing: {file_path}")
+    if message:
+        print(message)
+    return transcript
+
+def save_suggestion(file_path, suggestion, transcript=None):
+    """Validate a clip suggestion and save it next to the transcript, caching it for the transcript if given"""
+    if not suggestion:
+        print(f"❌ Failed to generate clip suggestion for: {file_path}")
+        return
     
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read().strip()
+    # Validate timestamps
+    start_time = suggestion.get("start", "00:00:00")
+    end_time = suggestion.get("end", "00:01:00")
+    
+    is_valid, message = validate_timestamps(start_time, end_time)
+    
+    if is_valid:
+        # Save suggestion as JSON
+        clip_file = get_clip_file(file_path)
         
-        if not content:
-            print(f"⚠️  File is empty: {file_path}")
-            return
+        # Write to a temp file and rename it into place, so a killed run never
+        # leaves a partial .clip.json that later runs would skip
+        tmp_file = clip_file + '.tmp'
+        with open(tmp_file, 'wb') as f:
+            f.write(orjson.dumps(suggestion, option=orjson.OPT_INDENT_2))
+        os.replace(tmp_file, clip_file)
         
-        # Check if this is an SRT file and extract text content
-        if file_path.endswith('.srt'):
-            print("📝 Processing SRT file - extracting text content")
-            transcript = extract_text_from_srt(content)
-        else:
-            transcript = content
+        # Only cache answers that passed validation, so a bad reply is retried next run
+        if transcript:
+            store_cached_suggestion(transcript, suggestion)
         
+        print(f"✅ Clip suggestion saved: {clip_file}")
+        print(f"🎬 Suggested clip: {start_time} - {end_time}")
+        print(f"💡 Reason: {suggestion.get('reason', 'No reason provided')}")
+    else:
+        print(f"❌ Invalid timestamps: {message}")
+        print(f"   Start: {start_time}, End: {end_time}")
+
+async def process_transcript_file_async(file_path, session, semaphore, pool):
+    """Process a single transcript file, awaiting the API call concurrently with other files"""
+    try:
+        transcript = await load_transcript_async(file_path, pool)
         if not transcript:
-            print(f"⚠️  No text content found in: {file_path}")
             return
         
-        if len(transcript) < 100:
-            print(f"⚠️  Transcript too short for analysis: {file_path}")
+        cached = load_cached_suggestion(transcript)
+        if cached:
+            save_suggestion(file_path, cached)
             return
         
-        print("🤖 Analyzing transcript for viral moments...")
-        suggestion = suggest_clip_with_api(transcript)
+        # Throttle in-flight requests to stay under the provider rate limit
+        async with semaphore:
+            print(f"🤖 Analyzing transcript for viral moments: {file_path}")
+            suggestion = await suggest_clip_with_api_async(session, transcript)
         
-        if suggestion:
-            # Validate timestamps
-            start_time = suggestion.get("start", "00:00:00")
-            end_time = suggestion.get("end", "00:01:00")
-            
-            is_valid, message = validate_timestamps(start_time, end_time)
-            
-            if is_valid:
-                # Save suggestion as JSON
-                base_name = Path(file_path).stem
-                clip_file = os.path.join(SUBTITLES_DIR, f"{base_name}.clip.json")
-                
-                with open(clip_file, 'w', encoding='utf-8') as f:
-                    json.dump(suggestion, f, indent=2, ensure_ascii=False)
-                
-                print(f"✅ Clip suggestion saved: {clip_file}")
-                print(f"🎬 Suggested clip: {start_time} - {end_time}")
-                print(f"💡 Reason: {suggestion.get('reason', 'No reason provided')}")
-            else:
-                print(f"❌ Invalid timestamps: {message}")
-                print(f"   Start: {start_time}, End: {end_time}")
-        else:
-            print(f"❌ Failed to generate clip suggestion for: {file_path}")
+        save_suggestion(file_path, suggestion, transcript)
             
     except Exception as e:
         print(f"❌ Error processing {file_path}: {e}")
+    finally:
+        print("-" * 50)
 
-def main():
+async def process_transcript_batch_async(file_paths, session, semaphore, pool):
+    """Process several transcript files with one API call, falling back to one call per file"""
+    # Read and parse the batch's files in worker processes
+    results = await asyncio.gather(*(load_transcript_async(file_path, pool) for file_path in file_paths))
+    
+    loaded = []
+    for file_path, transcript in zip(file_paths, results):
+        if not transcript:
+            continue
+        
+        # Cached transcripts are saved right away and left out of the request
+        cached = load_cached_suggestion(transcript)
+        if cached:
+            try:
+                save_suggestion(file_path, cached)
+            except Exception as e:
+                print(f"❌ Error processing {file_path}: {e}")
+            print("-" * 50)
+            continue
+        
+        loaded.append((file_path, transcript))
+    
+    if not loaded:
+        return
+    
+    suggestions = None
+    if len(loaded) > 1:
+        async with semaphore:
+            print(f"🤖 Analyzing {len(loaded)} transcripts for viral moments in one request...")
+            suggestions = await suggest_clips_batch_async(
+                session,
+                [Path(file_path).stem for file_path, _ in loaded],
+                [transcript for _, transcript in loaded]
+            )
+        
+        if suggestions is None:
+            print("⚠️  Could not use batched response, analyzing files one by one")
+    
+    if suggestions is None:
+        async def suggest_one(transcript):
+            async with semaphore:
+                return await suggest_clip_with_api_async(session, transcript)
+        
+        suggestions = await asyncio.gather(*(suggest_one(transcript) for _, transcript in loaded))
+    
+    for (file_path, transcript), suggestion in zip(loaded, suggestions):
+        try:
+            save_suggestion(file_path, suggestion, transcript)
+        except Exception as e:
+            print(f"❌ Error processing {file_path}: {e}")
+        print("-" * 50)
+
+async def main():
     """Main function to process all transcript files"""
+    parser = argparse.ArgumentParser(description="Suggest clip segments from transcripts")
+    parser.add_argument("--force", action="store_true",
+                        help="Re-analyze transcripts that already have a .clip.json")
+    args = parser.parse_args()
+    
     print("🎯 Starting clip suggestion analysis...")
     
     if not os.path.exists(SUBTITLES_DIR):
         print(f"❌ Subtitles directory not found: {SUBTITLES_DIR}")
         sys.exit(1)
     
-    # Find transcript files - prioritize SRT (from YouTube) over TXT (from whisper)
-    srt_files = list(Path(SUBTITLES_DIR).glob("*.srt"))
-    txt_files = list(Path(SUBTITLES_DIR).glob("*.txt"))
+    # Find transcript files and existing suggestions in a single directory scan
+    srt_files, txt_files, done = [], [], set()
+    for path in Path(SUBTITLES_DIR).iterdir():
+        suffix = path.suffix.lower()
+        if suffix == '.srt':
+            srt_files.append(path)
+        elif suffix == '.txt':
+            txt_files.append(path)
+        elif path.name.endswith('.clip.json'):
+            done.add(path.stem.removesuffix('.clip'))
     
-    # Use SRT files if available, otherwise fall back to TXT files
+    # Prioritize SRT (from YouTube) over TXT (from whisper)
     if srt_files:
         transcript_files = srt_files
         print(f"📝 Using {len(srt_files)} SRT files (YouTube subtitles)")
@@ -214,13 +548,40 @@ def main():
         print(f"❌ No subtitle files found in {SUBTITLES_DIR}")
         sys.exit(1)
     
+    # Reruns only need to handle transcripts without a suggestion yet
+    if not args.force:
+        pending = [f for f in transcript_files if f.stem not in done]
+        if len(pending) < len(transcript_files):
+            print(f"⏭️  Skipping {len(transcript_files) - len(pending)} transcripts with existing suggestions (use --force to redo)")
+        transcript_files = pending
+    
     print(f"📚 Found {len(transcript_files)} transcript files to analyze")
     
-    for transcript_file in transcript_files:
-        process_transcript_file(str(transcript_file))
-        print("-" * 50)
+    # API calls are pure network wait, so run them concurrently
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    # Keep-alive connection pool shared by all concurrent requests
+    connector = aiohttp.TCPConnector(limit=32, keepalive_timeout=60)
+    # Transcript parsing is CPU work, so it runs in worker processes
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as pool:
+        async with aiohttp.ClientSession(connector=connector) as session:
+            if BATCH_ENABLED:
+                # Fold several transcripts into each request (CLIP_BATCH=1)
+                batches = [
+                    [str(transcript_file) for transcript_file in transcript_files[i:i + BATCH_SIZE]]
+                    for i in range(0, len(transcript_files), BATCH_SIZE)
+                ]
+                print(f"📦 Sending {len(transcript_files)} transcripts in {len(batches)} batched requests")
+                await asyncio.gather(*(
+                    process_transcript_batch_async(batch, session, semaphore, pool)
+                    for batch in batches
+                ))
+            else:
+                await asyncio.gather(*(
+                    process_transcript_file_async(str(transcript_file), session, semaphore, pool)
+                    for transcript_file in transcript_files
+                ))
     
     print("🎉 Clip suggestion analysis complete!")
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
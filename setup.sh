@@ -38,7 +38,7 @@ python -m venv ~/automation/venv
 source ~/automation/venv/bin/activate
 
 echo "📥 Installing remaining packages in virtual environment..."
-pip install moviepy langdetect
+pip install moviepy langdetect orjson aiohttp
 
 echo "✅ Python dependencies installed!"
 echo "ℹ️  Note: When running scripts, use the virtual environment:"